@@ -1,9 +1,11 @@
 from __future__ import unicode_literals
 
+import functools
 import logging
 import pykka
 import pyconnman
 import dbus, gobject
+import dbus.mainloop.glib
 
 from mopidy import service
 from mopidy.utils.jsonrpc import private_method
@@ -12,9 +14,6 @@ logger = logging.getLogger(__name__)
 
 CONNMAN_SERVICE_NAME = 'connman'
 
-dbus.mainloop.glib.DBusGMainLoop(set_as_default=True)
-gobject.threads_init()
-
 
 def api_protect(f):
     """
@@ -23,11 +22,11 @@ def api_protect(f):
     will raise an exception if pyconnman manager is not
     ready. 
     """
-    def wrapper(*args, **kwargs):
-        if (args[0].manager is not None):
-            return f(*args, **kwargs)
-        else:
+    @functools.wraps(f)
+    def wrapper(self, *args, **kwargs):
+        if (self.manager is None):
             raise Exception('Service not ready')
+        return f(self, *args, **kwargs)
     return wrapper
 
 
@@ -35,12 +34,24 @@ def make_string(str):
     return dbus.String(str, variant_level=1)
 
 
-def convert_dbus(obj):
-    if (type(obj) is dbus.Byte):
-        return int(obj)
+def _identity(obj):
     return obj
 
 
+_CONVERTERS = {dbus.Byte: int,
+               dbus.Int16: int,
+               dbus.UInt16: int,
+               dbus.Int32: int,
+               dbus.UInt32: int,
+               dbus.Boolean: bool,
+               dbus.String: unicode,
+               dbus.ObjectPath: unicode}
+
+
+def convert_dbus(obj):
+    return _CONVERTERS.get(type(obj), _identity)(obj)
+
+
 class ConnectionManager(pykka.ThreadingActor, service.Service):
     """
     ConnectionManager is a network connection manager service.
@@ -61,57 +72,298 @@ class ConnectionManager(pykka.ThreadingActor, service.Service):
     readwrite_properties = ['Autoconnect', 'Nameservers.Configuration',
                             'Timeservers.Configuration', 'Domains.Configuration',
                             'IPv4.Configuration', 'IPv6.Configuration']
+    _ro_set = frozenset(readonly_properties)
+    _rw_set = frozenset(readwrite_properties)
+    _all_props = _ro_set | _rw_set
+
+    # Window (in ms) over which connection changes are merged into a
+    # single notification, e.g., during a scan
+    connections_flush_ms = 50
+
+    # Window (in ms) over which manager property changes are merged
+    # into a single notification
+    properties_flush_ms = 100
+
+    # The GLib main loop is set up on first start rather than at import
+    _glib_inited = False
 
     def __init__(self, config, core):
         super(ConnectionManager, self).__init__()
         self.config = dict(config['connman'])
+        self._powered_set = frozenset(self.config.get('powered', []))
+        self._scannable_set = frozenset(self.config.get('scannable', []))
+        self._update_apipa_config()
         self.manager = None
         self.agent = None
+        self._name_to_path = {}
+        self._services = {}
+        self._pending_connections = {}
+        self._connections_flush_id = None
+        self._pending_properties = {}
+        self._properties_flush_id = None
+        self._last_written = {}
+        self._tech_types = {}
+        self._techs = {}
+        self._signal_match = None
+
+    def _tell(self, method, *args):
+        """
+        Helper to run a method on the actor thread.  D-Bus signal
+        handlers and GLib timeouts run on the GLib main loop thread,
+        so they hand their work over to the actor with this rather
+        than touching the actor's state directly
+        """
+        try:
+            self.actor_ref.tell({'command': 'connman_call',
+                                 'method': method, 'args': args})
+        except pykka.ActorDeadError:
+            pass
+
+    @private_method
+    def on_receive(self, message):
+        """
+        Run a method handed over by :meth:`_tell`
+        """
+        if (message.get('command') == 'connman_call'):
+            getattr(self, message['method'])(*message['args'])
+
+    def _manager_signal_handler(self, *args, **kwargs):
+        """
+        Helper to pass a connman manager signal over to the actor
+        """
+        self._tell('_dispatch_manager_signal', kwargs['member'], args)
+
+    def _dispatch_manager_signal(self, signal, args):
+        """
+        Helper to dispatch a connman manager signal to its handler
+        """
+        if (self.manager is None):
+            return
+        handler = self._manager_signal_handlers.get(signal)
+        if (handler is not None):
+            handler(self, signal, None, *args)
 
     def _services_changed_handler(self, signal, user_arg, changed, removed):
         """
         Helper to notify when the available connman connections
         has changed
         """
+        if (removed):
+            for path in removed:
+                self._forget_service_path(path)
         if (changed):
+            all_props = self._all_props
             for i in changed:
-                (_, props) = i
+                (path, props) = i
                 if 'Name' in props:
-                    ret_props = {}
-                    for i in props.keys():
-                        if (i in self.readonly_properties + self.readwrite_properties):
-                            ret_props[i] = convert_dbus(props[i])
-                    service.ServiceListener.send('connman_connection_changed', service=self.name,
-                                                 connection=props.get('Name'), properties=ret_props)
+                    # Where services share a name, the first one seen
+                    # (i.e., highest priority) keeps it
+                    if (self._name_to_path.get(props['Name']) != path):
+                        self._forget_service_names(path)
+                        self._name_to_path.setdefault(props['Name'], path)
+                    ret_props = {k: convert_dbus(v) for (k, v) in props.iteritems()
+                                 if k in all_props}
+                    self._pending_connections[props['Name']] = ret_props
+            if (self._pending_connections and self._connections_flush_id is None):
+                self._connections_flush_id = \
+                    gobject.timeout_add(self.connections_flush_ms, self._tell,
+                                        '_flush_connections_changed')
+
+    def _flush_connections_changed(self):
+        """
+        Helper to notify a batch of connman connection changes
+        accumulated since the last flush
+        """
+        self._connections_flush_id = None
+        connections = self._pending_connections
+        self._pending_connections = {}
+        if (connections):
+            service.ServiceListener.send('connman_connections_changed', service=self.name,
+                                         connections=connections)
 
     def _property_changed_handler(self, signal, user_arg, prop_name, prop_value):
         """
         Helper to notify when a connman property has changed
         """
-        props = { prop_name: prop_value } 
-        service.ServiceListener.send('connman_property_changed', service=self.name,
-                                     properties=props)
+        self._pending_properties[prop_name] = prop_value
+        if (self._properties_flush_id is None):
+            self._properties_flush_id = \
+                gobject.timeout_add(self.properties_flush_ms, self._tell,
+                                    '_flush_property_changed')
+
+    def _flush_property_changed(self):
+        """
+        Helper to notify the latest values of connman properties
+        changed since the last flush
+        """
+        self._properties_flush_id = None
+        props = self._pending_properties
+        self._pending_properties = {}
+        if (props):
+            service.ServiceListener.send('connman_property_changed', service=self.name,
+                                         properties=props)
+
+    def _technology_added_handler(self, signal, user_arg, path, props):
+        """
+        Helper to track a newly added connman technology
+        """
+        self._tech_types[path] = props.get('Type')
+        self._techs.pop(path, None)
+
+    def _technology_removed_handler(self, signal, user_arg, path):
+        """
+        Helper to drop a removed connman technology
+        """
+        self._tech_types.pop(path, None)
+        self._techs.pop(path, None)
+        self._forget_written(path)
+
+    _manager_signal_handlers = {
+        pyconnman.ConnManager.SIGNAL_SERVICES_CHANGED: _services_changed_handler,
+        pyconnman.ConnManager.SIGNAL_PROPERTY_CHANGED: _property_changed_handler,
+        pyconnman.ConnManager.SIGNAL_TECHNOLOGY_ADDED: _technology_added_handler,
+        pyconnman.ConnManager.SIGNAL_TECHNOLOGY_REMOVED: _technology_removed_handler,
+    }
+
+    def _get_technology(self, path):
+        """
+        Helper to return the ConnTechnology object for a technology
+        path, creating it on first use
+        """
+        tech = self._techs.get(path)
+        if (tech is None):
+            tech = pyconnman.ConnTechnology(path)
+            self._techs[path] = tech
+        return tech
 
     def _get_service_by_name(self, name):
         """
         Helper to find a service (aka connection) by its name
         and return its ConnService object
         """
-        for (path, params) in self.manager.get_services():
-            if (params.get('Name') == name):
-                return pyconnman.ConnService(path)
+        path = self._name_to_path.get(name)
+        if (path is None):
+            # Not seen via the services changed handler yet, so fall
+            # back to asking connman directly
+            path = next((p for (p, params) in self.manager.get_services()
+                         if params.get('Name') == name), None)
+            if (path is None):
+                return None
+            self._name_to_path[name] = path
+        s = self._services.get(path)
+        if (s is None):
+            s = pyconnman.ConnService(path)
+            self._services[path] = s
+        return s
+
+    def _forget_service_path(self, path):
+        """
+        Helper to drop a service path from the name and proxy caches
+        """
+        self._services.pop(path, None)
+        self._forget_service_names(path)
+
+    def _forget_service_names(self, path):
+        """
+        Helper to drop any names mapped to a service path
+        """
+        for name in [n for (n, p) in self._name_to_path.iteritems() if p == path]:
+            del self._name_to_path[name]
+
+    def _forget_written(self, path):
+        """
+        Helper to drop any outstanding property writes for a path
+        """
+        for key in [k for k in self._last_written if k[0] == path]:
+            del self._last_written[key]
+
+    def _set_powered(self, tech, powered):
+        """
+        Helper to power a technology on or off without blocking
+        on the D-Bus reply.  The write is skipped if the same
+        value is still being written to the technology
+        """
+        key = (tech._object.__dbus_object_path__, 'Powered')
+        if (self._last_written.get(key) == powered):
+            return
+
+        def reply_handler():
+            self._tell('_set_powered_done', key, powered, None)
+
+        def error_handler(e):
+            self._tell('_set_powered_done', key, powered, e)
+
+        tech._interface.SetProperty('Powered',
+                                    dbus.Boolean(powered, variant_level=1),
+                                    reply_handler=reply_handler,
+                                    error_handler=error_handler)
+        self._last_written[key] = powered
+
+    def _set_powered_done(self, key, powered, e):
+        """
+        Helper to complete a technology power write
+        """
+        if (self._last_written.get(key) == powered):
+            del self._last_written[key]
+        if (e is not None):
+            logger.warning('ConnectionManager failed to set Powered=%s: %s',
+                           powered, e)
+
+    def _update_apipa_config(self):
+        """
+        Helper to build the APIPA IPv4 configuration from the
+        current config properties
+        """
+        self._apipa_config = {'Method': make_string('manual'),
+                              'Address': make_string(self.config['apipa_ipaddr']),
+                              'Netmask': make_string(self.config['apipa_netmask'])}
+
+    def _apply_apipa(self):
+        """
+        Helper to configure and connect the APIPA interface if APIPA
+        is enabled and the connection is idle
+        """
+        if (self.get_connection_state() == 'idle' and self.config['apipa_enabled']):
+            s = self._get_service_by_name(self.config['apipa_interface'])
+            if (s is not None):
+                s.set_property('IPv4.Configuration', self._apipa_config)
+                s.connect()
+
+    def _apply_config_change(self, name, value):
+        """
+        Helper to apply a changed config property to the running
+        service, touching only the affected connman objects
+        """
+        if (name == 'powered'):
+            # As at start-up, newly listed technologies are powered on
+            # if they are not already, and nothing is powered off
+            added = frozenset(value) - self._powered_set
+            self._powered_set = frozenset(value)
+            if (self.manager is not None):
+                for (path, tech_type) in self._tech_types.iteritems():
+                    if (tech_type in added):
+                        tech = self._get_technology(path)
+                        if (not tech.Powered):
+                            self._set_powered(tech, True)
+        elif (name == 'scannable'):
+            self._scannable_set = frozenset(value)
+        elif (name.startswith('apipa_')):
+            self._update_apipa_config()
+            if (self.manager is not None):
+                self._apply_apipa()
 
     def _unregister_wifi_agent(self):
         """
         Helper to unregister a wifi agent if once is registered
         """
-        try:
-            if (self.agent):
+        if (self.agent):
+            try:
                 self.agent.remove_from_connection()
                 self.manager.unregister_agent(self.agent_path)
+            except dbus.exceptions.DBusException:
+                pass
+            finally:
                 self.agent = None
-        except:
-            pass
 
     @private_method
     def on_start(self):
@@ -121,38 +373,54 @@ class ConnectionManager(pykka.ThreadingActor, service.Service):
         if (self.manager):
             return
 
+        if (not ConnectionManager._glib_inited):
+            dbus.mainloop.glib.DBusGMainLoop(set_as_default=True)
+            gobject.threads_init()
+            ConnectionManager._glib_inited = True
+
         # Create connman manager
         manager = pyconnman.ConnManager()
-        manager.add_signal_receiver(self._services_changed_handler,
-                                    pyconnman.ConnManager.SIGNAL_SERVICES_CHANGED,
-                                    None)
-        manager.add_signal_receiver(self._property_changed_handler,
-                                    pyconnman.ConnManager.SIGNAL_PROPERTY_CHANGED,
-                                    None)
+        self._signal_match = \
+            manager._bus.add_signal_receiver(self._manager_signal_handler,
+                                             dbus_interface='net.connman.Manager',
+                                             bus_name='net.connman',
+                                             path='/',
+                                             member_keyword='member')
         self.manager = manager
 
+        # Seed the connection name cache; thereafter it is kept up-to-date
+        # by the services changed handler.  Services are listed in
+        # priority order, so the first service with a name keeps it
+        self._name_to_path = {}
+        self._services = {}
+        for (path, params) in self.manager.get_services():
+            if ('Name' in params):
+                self._name_to_path.setdefault(params['Name'], path)
+
         # Create agent for authenticating WiFi connections
         self._unregister_wifi_agent()
         self.agent = pyconnman.SimpleWifiAgent(self.agent_path)
         self.manager.register_agent(self.agent_path)
 
         # Enable the services listed in default configuration -
-        # anything listed is powered on.  Otherwise it is
-        # powered off.
-        for (path,_) in self.manager.get_technologies():
-            tech = pyconnman.ConnTechnology(path)
-            if (tech.Type in self.config['powered'] and not tech.Powered):
-                tech.Powered = True
+        # anything listed that is not already powered on is
+        # powered on.  The technology properties are already
+        # returned with the list, so only those technologies that
+        # need powering on are written to, without awaiting replies.
+        # The technology types are cached; thereafter they are kept
+        # up-to-date by the technology added/removed handlers
+        self._tech_types = {}
+        self._techs = {}
+        unpowered = []
+        for (path, params) in self.manager.get_technologies():
+            self._tech_types[path] = params.get('Type')
+            if (params.get('Type') in self._powered_set and not params.get('Powered')):
+                unpowered.append(path)
+        for path in unpowered:
+            self._set_powered(self._get_technology(path), True)
 
         # Try APIPA if it is enable and the connection is idle
-        if (self.get_connection_state() == 'idle' and self.config['apipa_enabled']):
-            config = {'Method': make_string('manual'),
-                      'Address': make_string(self.config['apipa_ipaddr']),
-                      'Netmask': make_string(self.config['apipa_netmask'])}
-            s = self._get_service_by_name(self.config['apipa_interface'])
-            if (s is not None):
-                s.set_property('IPv4.Configuration', config)
-                s.connect()
+        self._apply_apipa()
 
         # Notify listeners
         self.state = service.ServiceState.SERVICE_STATE_STARTED
@@ -169,9 +437,17 @@ class ConnectionManager(pykka.ThreadingActor, service.Service):
 
         # Remove previously installed wifi agent and signal handlers
         self._unregister_wifi_agent()
-        self.manager.remove_signal_receiver(pyconnman.ConnManager.SIGNAL_SERVICES_CHANGED)
-        self.manager.remove_signal_receiver(pyconnman.ConnManager.SIGNAL_PROPERTY_CHANGED)
+        self._signal_match.remove()
+        self._signal_match = None
         self.manager = None
+        self._name_to_path = {}
+        self._services = {}
+        self._tech_types = {}
+        self._techs = {}
+        # Any flush already scheduled will find nothing left to send
+        self._pending_connections = {}
+        self._pending_properties = {}
+        self._last_written = {}
 
         # Notify listeners
         self.state = service.ServiceState.SERVICE_STATE_STOPPED
@@ -204,10 +480,9 @@ class ConnectionManager(pykka.ThreadingActor, service.Service):
         This will result in the SIGNAL_SERVICES_CHANGED signal
         being posted for each different technology scanned
         """
-        for (path,_) in self.manager.get_technologies():
-            tech = pyconnman.ConnTechnology(path)
-            if tech.Type in self.config['scannable']:
-                tech.scan()
+        for (path, tech_type) in self._tech_types.iteritems():
+            if (tech_type in self._scannable_set):
+                self._get_technology(path).scan()
 
     @api_protect
     def get_connection_state(self):
@@ -250,12 +525,9 @@ class ConnectionManager(pykka.ThreadingActor, service.Service):
         """
         s = self._get_service_by_name(conn)
         if (s is not None):
-            ret_props = {}
-            props = s.get_property()
-            for i in props.keys():
-                if (i in self.readonly_properties + self.readwrite_properties):
-                    ret_props[i] = convert_dbus(props[i])
-            return ret_props
+            all_props = self._all_props
+            return {k: convert_dbus(v) for (k, v) in s.get_property().iteritems()
+                    if k in all_props}
 
     @api_protect
     def set_connection_properties(self, conn, set_props):
@@ -267,10 +539,8 @@ class ConnectionManager(pykka.ThreadingActor, service.Service):
         """
         s = self._get_service_by_name(conn)
         if (s is not None):
-            props = s.get_property()
-            for i in props.keys():
-                if (i in self.readwrite_properties):
-                    s.set_property(i, set_props[i])
+            for k in self._rw_set.intersection(set_props):
+                s.set_property(k, set_props[k])
 
     @api_protect
     def set_wifi_config(self, conn, config):
@@ -293,10 +563,7 @@ class ConnectionManager(pykka.ThreadingActor, service.Service):
         :param config: configuration properties dictionary
         """
         allowed_config = ['name', 'ssid', 'passphrase', 'wpspin']
-        set_config = {}
-        for i in config.keys():
-            if i in allowed_config:
-                set_config[i] = config[i]
+        set_config = {k: config[k] for k in allowed_config if k in config}
         if (conn is not None):
             s = self._get_service_by_name(conn)
             if (s is not None):
@@ -317,8 +584,7 @@ class ConnectionManager(pykka.ThreadingActor, service.Service):
             service.ServiceListener.send('service_property_changed',
                                          service=self.name,
                                          props={ name: value })
-            self.enable()
-            self.disable()
+            self._apply_config_change(name, value)
 
     def get_property(self, name):
         """
@@ -326,12 +592,10 @@ class ConnectionManager(pykka.ThreadingActor, service.Service):
         """
         if (name is None):
             return self.config
+        elif (name in self.config):
+            return { name: self.config[name] }
         else:
-            try:
-                value = self.config[name]
-                return { name: value }
-            except:
-                return None
+            return None
 
     def enable(self):
         """